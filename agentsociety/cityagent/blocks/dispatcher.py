@@ -22,6 +22,8 @@ class BlockDispatcher:
         llm: Language model interface for decision-making
         blocks: Registry of available processing blocks (name -> Block mapping)
         prompt: Formatted prompt template for LLM instructions
+        last_dispatch_fallback: Whether the most recent dispatch() returned the
+            random fallback instead of a genuine router decision
     """
 
     def __init__(self, llm: LLM):
@@ -33,6 +35,7 @@ class BlockDispatcher:
         self.llm = llm
         self.blocks: dict[str, Block] = {}
         self.prompt = FormatPrompt(DISPATCHER_PROMPT)
+        self.last_dispatch_fallback = False
 
     def register_blocks(self, blocks: list[Block]) -> None:
         """Register multiple processing blocks for dispatching.
@@ -114,8 +117,10 @@ class BlockDispatcher:
                     f"Selected block '{selected_block}' not found in registered blocks"
                 )
 
+            self.last_dispatch_fallback = False
             return self.blocks[selected_block]
 
         except Exception as e:
             logger.warning(f"Failed to dispatch block: {e}")
+            self.last_dispatch_fallback = True
             return random.choice(list(self.blocks.values()))
@@ -1,12 +1,18 @@
-import json
+import asyncio
 import logging
 import math
 import random
+import re
+from collections import OrderedDict
 from operator import itemgetter
 from typing import Any
 
 import numpy as np
-import ray
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
 from agentsociety.environment import Simulator
 from agentsociety.llm import LLM
@@ -14,62 +20,166 @@ from agentsociety.memory import Memory
 from agentsociety.workflow import Block, FormatPrompt
 
 from .dispatcher import BlockDispatcher
-from .utils import clean_json_response
+from .utils import cached_atext_request, clean_json_response, json_loads
 
 logger = logging.getLogger("agentsociety")
 
-# Prompt templates for LLM interactions
-PLACE_TYPE_SELECTION_PROMPT = """
+# Prompt templates for LLM interactions.
+# The static instructions live in the system prompt (built once per block and
+# byte-identical across agents and ticks, which keeps provider-side prompt
+# caches hot); only the short user message varies per call.
+PLACE_TYPE_SELECTION_SYSTEM_PROMPT = """
 As an intelligent decision system, please determine the type of place the user needs to visit based on their input requirement.
-User Plan: {plan}
-User requirement: {intention}
-Your output must be a single selection from {poi_category} without any additional text or explanation.
+Your output must be a single selection from the category list given in the user message without any additional text or explanation.
 
 Please response in json format (Do not return any other text), example:
-{{
+{
     "place_type": "shopping"
-}}
+}
+"""
+
+PLACE_TYPE_SELECTION_PROMPT = """
+User Plan: {plan}
+User requirement: {intention}
+Category list: {poi_category}
 """
 
 PLACE_SECOND_TYPE_SELECTION_PROMPT = """
-As an intelligent decision system, please determine the type of place the user needs to visit based on their input requirement.
 User Plan: {plan}
 User requirement: {intention}
-Your output must be a single selection from {poi_category} without any additional text or explanation.
+Category list: {poi_category}
+"""
+
+PLACE_ANALYSIS_SYSTEM_PROMPT = """
+As an intelligent analysis system, please determine the type of place the user needs to visit based on their input requirement.
+Your output must be a single selection from ['home', 'workplace', 'other'] without any additional text or explanation.
 
 Please response in json format (Do not return any other text), example:
-{{
-    "place_type": "shopping"
-}}
+{
+    "place_type": "home"
+}
 """
 
 PLACE_ANALYSIS_PROMPT = """
-As an intelligent analysis system, please determine the type of place the user needs to visit based on their input requirement.
 User Plan: {plan}
 User requirement: {intention}
+"""
 
-Your output must be a single selection from ['home', 'workplace', 'other'] without any additional text or explanation.
+RADIUS_SYSTEM_PROMPT = """As an intelligent decision system, please determine the maximum travel radius (in meters) based on the current emotional state.
+
+Please analyze how these emotions would affect travel willingness and return only a single integer number between 3000-200000 representing the maximum travel radius in meters. A more positive emotional state generally leads to greater willingness to travel further.
 
 Please response in json format (Do not return any other text), example:
-{{
-    "place_type": "home"
-}}
+{
+    "radius": 10000
+}
 """
 
-RADIUS_PROMPT = """As an intelligent decision system, please determine the maximum travel radius (in meters) based on the current emotional state.
+# Deterministic place-type classification for unambiguous intentions; the LLM
+# is only consulted when neither pattern matches
+HOME_INTENTION_RE = re.compile(r"\b(home|house|apartment|bed)\b", re.IGNORECASE)
+WORK_INTENTION_RE = re.compile(r"\b(work|office|job|workplace)\b", re.IGNORECASE)
 
-Current weather: {weather}
+RADIUS_PROMPT = """Current weather: {weather}
 Current temperature: {temperature}
 Your current emotion: {emotion_types}
 Your current thought: {thought}
+"""
 
-Please analyze how these emotions would affect travel willingness and return only a single integer number between 3000-200000 representing the maximum travel radius in meters. A more positive emotional state generally leads to greater willingness to travel further.
 
-Please response in json format (Do not return any other text), example:
-{{
-    "radius": 10000
-}}
-"""
+# Module-level PCG64 generator: each process/Ray actor gets its own instance,
+# avoiding the mutex-guarded legacy global RandomState
+_rng = np.random.default_rng()
+
+# Ring areas between (d-1)km and d km, precomputed once at import
+_RING_EDGES = np.arange(11, dtype=np.float64) * 1000
+_RING_AREA = math.pi * (_RING_EDGES[1:] ** 2 - _RING_EDGES[:-1] ** 2)
+
+
+def _gravity_core_np(dists):
+    """NumPy implementation of the gravity kernel (fallback when numba is absent)."""
+    bin_idx = np.floor(dists / 1000).astype(np.int64)
+    within = bin_idx < 10
+    bins = bin_idx[within]
+
+    # POI count per 1km ring
+    counts = np.bincount(bins, minlength=10)
+
+    density = counts[bins] / _RING_AREA[bins]  # POIs per square meter
+    distance = np.maximum(dists[within], 1)  # Avoid division by zero
+
+    weight = np.zeros(len(dists), dtype=np.float64)
+    prob = np.zeros(len(dists), dtype=np.float64)
+    # Inverse square distance decay combined with density
+    weight[within] = density / (distance**2)
+    prob[within] = 1 / np.sqrt(distance)
+    return weight, prob
+
+
+def _gravity_core_loop(dists):
+    """Single-pass gravity kernel, written loop-style for numba compilation."""
+    n = dists.shape[0]
+    counts = np.zeros(11, dtype=np.float64)
+    bins = np.empty(n, dtype=np.int64)
+    for i in range(n):
+        b = int(dists[i] // 1000.0)
+        if b > 10:
+            b = 10
+        bins[i] = b
+        counts[b] += 1.0
+    weight = np.zeros(n, dtype=np.float64)
+    prob = np.zeros(n, dtype=np.float64)
+    for i in range(n):
+        b = bins[i]
+        if b < 10:
+            density = counts[b] / _RING_AREA[b]
+            distance = dists[i] if dists[i] > 1.0 else 1.0
+            weight[i] = density / (distance * distance)
+            prob[i] = 1.0 / math.sqrt(distance)
+    return weight, prob
+
+
+if njit is not None:
+    _gravity_core = njit(cache=True, fastmath=True)(_gravity_core_loop)
+    _gravity_core(np.ones(1))  # warm the JIT cache at import
+else:
+    _gravity_core = _gravity_core_np
+
+
+def _alias_sample(probs, size):
+    """
+    Draw `size` indices from a discrete distribution with Walker's alias method.
+
+    One O(N) table build, then each draw costs a single uniform variate plus
+    one comparison, instead of the CDF build + binary search per draw that
+    np.random.choice performs.
+
+    Args:
+        probs: 1-D array of probabilities summing to 1
+        size: Number of indices to draw
+
+    Returns:
+        np.ndarray of sampled indices
+    """
+    n = len(probs)
+    scaled = probs * n
+    prob_table = np.ones(n, dtype=np.float64)
+    alias_table = np.zeros(n, dtype=np.int64)
+    small = [i for i in range(n) if scaled[i] < 1.0]
+    large = [i for i in range(n) if scaled[i] >= 1.0]
+    while small and large:
+        s = small.pop()
+        l = large.pop()
+        prob_table[s] = scaled[s]
+        alias_table[s] = l
+        scaled[l] -= 1.0 - scaled[s]
+        if scaled[l] < 1.0:
+            small.append(l)
+        else:
+            large.append(l)
+    # Leftovers in either worklist are 1.0 up to float error
+    idx = _rng.integers(0, n, size=size)
+    return np.where(_rng.random(size) < prob_table[idx], idx, alias_table[idx])
 
 
 def gravity_model(pois):
@@ -87,51 +197,31 @@ def gravity_model(pois):
         List of tuples: (name, id, normalized_weight, distance)
         with selection probabilities based on gravity model
     """
-    # Initialize distance bins
-    pois_Dis = {f"{d}k": [] for d in range(1, 11)}
-    pois_Dis["more"] = []
-
-    # Categorize POIs into distance bins
-    for poi in pois:
-        classified = False
-        for d in range(1, 11):
-            if (d - 1) * 1000 <= poi[1] < d * 1000:
-                pois_Dis[f"{d}k"].append(poi)
-                classified = True
-                break
-        if not classified:
-            pois_Dis["more"].append(poi)
-
-    res = []
-    distanceProb = []
-    # Calculate weights for each POI
-    for poi in pois:
-        for d in range(1, 11):
-            if (d - 1) * 1000 <= poi[1] < d * 1000:
-                n = len(pois_Dis[f"{d}k"])
-                # Calculate ring area between (d-1)km and d km
-                S = math.pi * ((d * 1000) ** 2 - ((d - 1) * 1000) ** 2)
-                density = n / S  # POIs per square meter
-                distance = max(poi[1], 1)  # Avoid division by zero
-
-                # Inverse square distance decay combined with density
-                weight = density / (distance**2)
-                res.append((poi[0]["name"], poi[0]["id"], weight, distance))
-                distanceProb.append(1 / math.sqrt(distance))
-                break
+    dists = np.fromiter((poi[1] for poi in pois), dtype=np.float64, count=len(pois))
+    weight, prob = _gravity_core(dists)
+
+    # POIs beyond 10km fall into the 'more' category (zero probability)
+    within = np.nonzero(prob > 0)[0]
+    weight = weight[within]
+    distance = np.maximum(dists[within], 1)
 
     # Normalize probabilities and sample
-    distanceProb = np.array(distanceProb)
+    distanceProb = prob[within]
     distanceProb /= distanceProb.sum()
 
     # Randomly sample 50 candidates weighted by distance probabilities
-    sample_indices = np.random.choice(len(res), size=50, p=distanceProb)
-    sampled_pois = [res[i] for i in sample_indices]
+    sample_indices = _alias_sample(distanceProb, 50)
 
     # Normalize weights for final selection
-    total_weight = sum(item[2] for item in sampled_pois)
+    total_weight = weight[sample_indices].sum()
     return [
-        (item[0], item[1], item[2] / total_weight, item[3]) for item in sampled_pois
+        (
+            pois[within[i]][0]["name"],
+            pois[within[i]][0]["id"],
+            weight[i] / total_weight,
+            distance[i],
+        )
+        for i in sample_indices
     ]
 
 
@@ -151,6 +241,22 @@ class PlaceSelectionBlock(Block):
     configurable_fields = ["search_limit"]
     default_values = {"search_limit": 50}
 
+    # Stateless format wrappers, shared across all agents' block instances
+    typeSelectionPrompt = FormatPrompt(
+        PLACE_TYPE_SELECTION_PROMPT,
+        system_prompt=PLACE_TYPE_SELECTION_SYSTEM_PROMPT,
+    )
+    secondTypeSelectionPrompt = FormatPrompt(
+        PLACE_SECOND_TYPE_SELECTION_PROMPT,
+        system_prompt=PLACE_TYPE_SELECTION_SYSTEM_PROMPT,
+    )
+    radiusPrompt = FormatPrompt(RADIUS_PROMPT, system_prompt=RADIUS_SYSTEM_PROMPT)
+
+    # Per-tick POI query cache shared by all agents: agents clustered at the
+    # same position with the same type/radius reuse one map query
+    _query_pois_cache: dict = {}
+    _query_pois_cache_tick = None
+
     def __init__(self, llm: LLM, memory: Memory, simulator: Simulator):
         super().__init__(
             "PlaceSelectionBlock", llm=llm, memory=memory, simulator=simulator
@@ -158,89 +264,125 @@ class PlaceSelectionBlock(Block):
         self.description = (
             "Selects destinations for unknown locations (excluding home/work)"
         )
-        self.typeSelectionPrompt = FormatPrompt(PLACE_TYPE_SELECTION_PROMPT)
-        self.secondTypeSelectionPrompt = FormatPrompt(
-            PLACE_SECOND_TYPE_SELECTION_PROMPT
-        )
-        self.radiusPrompt = FormatPrompt(RADIUS_PROMPT)
         self.search_limit = 50  # Default config value
+        # POI categories are invariant over the process lifetime; fetched lazily
+        self._poi_cate = None
+        self._poi_cate_keys = None
+        self._poi_cate_keys_str = None
+
+    def invalidate_poi_cate(self):
+        """Drop the cached POI categories so they are re-fetched on next use."""
+        self._poi_cate = None
+        self._poi_cate_keys = None
+        self._poi_cate_keys_str = None
 
     async def forward(self, step, context):  # type:ignore
         """Execute the destination selection workflow"""
+        # The radius prompt only depends on emotion/thought/weather, so issue it
+        # concurrently with the two type-selection calls to overlap LLM latency
+        status = await self.memory.status.mget(
+            ["emotion_types", "thought", "position"]
+        )
+        radius_dialog = self.radiusPrompt.format_to_dialog(
+            emotion_types=status["emotion_types"],
+            thought=status["thought"],
+            weather=self.simulator.sence("weather"),
+            temperature=self.simulator.sence("temperature"),
+        )
+        radius_task = asyncio.create_task(
+            cached_atext_request(
+                self.llm,
+                radius_dialog,
+                response_format={"type": "json_object"},
+            )
+        )
+
         # Stage 1: Select primary POI category
-        poi_cate = self.simulator.get_poi_cate()
-        self.typeSelectionPrompt.format(
+        if self._poi_cate is None:
+            self._poi_cate = self.simulator.get_poi_cate()
+            self._poi_cate_keys = list(self._poi_cate.keys())
+            # Pre-stringified once so formatted prompts are byte-identical
+            # across calls (keeps remote prompt caches hot)
+            self._poi_cate_keys_str = str(self._poi_cate_keys)
+        poi_cate = self._poi_cate
+        type_selection_dialog = self.typeSelectionPrompt.format_to_dialog(
             plan=context["plan"],
             intention=step["intention"],
-            poi_category=list(poi_cate.keys()),
+            poi_category=self._poi_cate_keys_str,
         )
         try:
             # LLM-based category selection
-            levelOneType = await self.llm.atext_request(
-                self.typeSelectionPrompt.to_dialog(),
+            levelOneType = await cached_atext_request(
+                self.llm,
+                type_selection_dialog,
                 response_format={"type": "json_object"},
             )
-            levelOneType = json.loads(clean_json_response(levelOneType))[  # type:ignore
+            levelOneType = json_loads(clean_json_response(levelOneType))[  # type:ignore
                 "place_type"
             ]
             sub_category = poi_cate[levelOneType]
         except Exception as e:
             logger.warning(f"Level 1 selection failed: {e}")
-            levelOneType = random.choice(list(poi_cate.keys()))
+            levelOneType = random.choice(self._poi_cate_keys)
             sub_category = poi_cate[levelOneType]
 
         # Stage 2: Select sub-category
         try:
-            self.secondTypeSelectionPrompt.format(
+            second_type_dialog = self.secondTypeSelectionPrompt.format_to_dialog(
                 plan=context["plan"],
                 intention=step["intention"],
                 poi_category=sub_category,
             )
-            levelTwoType = await self.llm.atext_request(
-                self.secondTypeSelectionPrompt.to_dialog(),
+            levelTwoType = await cached_atext_request(
+                self.llm,
+                second_type_dialog,
                 response_format={"type": "json_object"},
             )
-            levelTwoType = json.loads(clean_json_response(levelTwoType))[  # type:ignore
+            levelTwoType = json_loads(clean_json_response(levelTwoType))[  # type:ignore
                 "place_type"
             ]
         except Exception as e:
             logger.warning(f"Level 2 selection failed: {e}")
             levelTwoType = random.choice(sub_category)
 
-        # Get travel radius from LLM
+        # Collect the concurrently issued radius request
         try:
-            self.radiusPrompt.format(
-                emotion_types=await self.memory.status.get("emotion_types"),
-                thought=await self.memory.status.get("thought"),
-                weather=self.simulator.sence("weather"),
-                temperature=self.simulator.sence("temperature"),
-            )
-            radius = await self.llm.atext_request(
-                self.radiusPrompt.to_dialog(), response_format={"type": "json_object"}
-            )
-            radius = int(json.loads(radius)["radius"])  # type:ignore
+            (radius,) = await asyncio.gather(radius_task, return_exceptions=True)
+            if isinstance(radius, BaseException):
+                raise radius
+            radius = int(json_loads(radius)["radius"])  # type:ignore
         except Exception as e:
             logger.warning(f"Radius selection failed: {e}")
             radius = 10000  # Default 10km
 
         # Query and select POI
-        center = (await self.memory.status.get("position")).values()
-        pois = ray.get(
-            self.simulator.map.query_pois.remote(  # type:ignore
+        pos = status["position"]
+        if "xy_position" in pos:
+            center = (pos["xy_position"]["x"], pos["xy_position"]["y"])
+        else:
+            center = tuple(pos.values())
+        cache_key = (center, levelTwoType, radius, self.search_limit)
+        tick = self.simulator.time
+        if PlaceSelectionBlock._query_pois_cache_tick != tick:
+            PlaceSelectionBlock._query_pois_cache = {}
+            PlaceSelectionBlock._query_pois_cache_tick = tick
+        pois = self._query_pois_cache.get(cache_key)
+        if pois is None:
+            pois = await self.simulator.query_pois(
                 center=center,
                 category_prefix=levelTwoType,
                 radius=radius,
                 limit=self.search_limit,
             )
-        )
+            self._query_pois_cache[cache_key] = pois
 
         if pois:
             pois = gravity_model(pois)
             probabilities = [item[2] for item in pois]
-            selected = np.random.choice(len(pois), p=probabilities)
+            selected = _rng.choice(len(pois), p=probabilities)
             next_place = (pois[selected][0], pois[selected][1])
         else:  # Fallback random selection
-            all_pois = ray.get(self.simulator.map.get_pois.remote())  # type:ignore
+            all_pois = await self.simulator.map.get_poi.remote()  # type:ignore
             next_place = random.choice(all_pois)
 
         context["next_place"] = next_place
@@ -258,28 +400,43 @@ class PlaceSelectionBlock(Block):
 class MoveBlock(Block):
     """Block for executing mobility operations (home/work/other)"""
 
+    # Stateless format wrapper, shared across all agents' block instances
+    placeAnalysisPrompt = FormatPrompt(
+        PLACE_ANALYSIS_PROMPT, system_prompt=PLACE_ANALYSIS_SYSTEM_PROMPT
+    )
+
     def __init__(self, llm: LLM, memory: Memory, simulator: Simulator):
         super().__init__("MoveBlock", llm=llm, memory=memory, simulator=simulator)
         self.description = "Executes mobility operations between locations"
-        self.placeAnalysisPrompt = FormatPrompt(PLACE_ANALYSIS_PROMPT)
+        # AOIs are static; fetched once on first fallback and pre-filtered to
+        # those that actually contain POIs
+        self._aois_with_pois = None
 
     async def forward(self, step, context):  # type:ignore
         agent_id = await self.memory.status.get("id")
-        self.placeAnalysisPrompt.format(
-            plan=context["plan"], intention=step["intention"]
-        )
-        response = await self.llm.atext_request(self.placeAnalysisPrompt.to_dialog(), response_format={"type": "json_object"})  # type: ignore
-        try:
-            response = clean_json_response(response)
-            response = json.loads(response)["place_type"]
-        except Exception as e:
-            logger.warning(f"Place Analysis: wrong type of place, raw response: {response}")
+        # Rule-based fast path: obvious keywords settle the place type without
+        # an LLM round-trip
+        intention = step["intention"]
+        if HOME_INTENTION_RE.search(intention):
             response = "home"
+        elif WORK_INTENTION_RE.search(intention):
+            response = "workplace"
+        else:
+            place_analysis_dialog = self.placeAnalysisPrompt.format_to_dialog(
+                plan=context["plan"], intention=intention
+            )
+            response = await cached_atext_request(self.llm, place_analysis_dialog, response_format={"type": "json_object"})  # type: ignore
+            try:
+                response = clean_json_response(response)
+                response = json_loads(response)["place_type"]
+            except Exception as e:
+                logger.warning(f"Place Analysis: wrong type of place, raw response: {response}")
+                response = "home"
         if response == "home":
             # go back home
-            home = await self.memory.status.get("home")
-            home = home["aoi_position"]["aoi_id"]
-            nowPlace = await self.memory.status.get("position")
+            vals = await self.memory.status.mget(["home", "position"])
+            home = vals["home"]["aoi_position"]["aoi_id"]
+            nowPlace = vals["position"]
             node_id = await self.memory.stream.add_mobility(
                 description=f"I returned home"
             )
@@ -298,9 +455,7 @@ class MoveBlock(Block):
                 person_id=agent_id,
                 target_positions=home,
             )
-            number_poi_visited = await self.memory.status.get("number_poi_visited")
-            number_poi_visited += 1
-            await self.memory.status.update("number_poi_visited", number_poi_visited)
+            await self.memory.status.incr("number_poi_visited")
             return {
                 "success": True,
                 "evaluation": f"Successfully returned home",
@@ -310,9 +465,9 @@ class MoveBlock(Block):
             }
         elif response == "workplace":
             # back to workplace
-            work = await self.memory.status.get("work")
-            work = work["aoi_position"]["aoi_id"]
-            nowPlace = await self.memory.status.get("position")
+            vals = await self.memory.status.mget(["work", "position"])
+            work = vals["work"]["aoi_position"]["aoi_id"]
+            nowPlace = vals["position"]
             node_id = await self.memory.stream.add_mobility(
                 description=f"I went to my workplace"
             )
@@ -331,9 +486,7 @@ class MoveBlock(Block):
                 person_id=agent_id,
                 target_positions=work,
             )
-            number_poi_visited = await self.memory.status.get("number_poi_visited")
-            number_poi_visited += 1
-            await self.memory.status.update("number_poi_visited", number_poi_visited)
+            await self.memory.status.incr("number_poi_visited")
             return {
                 "success": True,
                 "evaluation": f"Successfully reached the workplace",
@@ -354,21 +507,20 @@ class MoveBlock(Block):
                     target_positions=next_place[1],
                 )
             else:
-                aois = ray.get(self.simulator.map.get_aoi.remote())
-                while True:
-                    r_aoi = random.choice(aois)
-                    if len(r_aoi["poi_ids"]) > 0:
-                        r_poi = random.choice(r_aoi["poi_ids"])
-                        break
-                poi = ray.get(self.simulator.map.get_poi.remote(r_poi))
+                if self._aois_with_pois is None:
+                    aois = await self.simulator.map.get_aoi.remote()  # type:ignore
+                    self._aois_with_pois = [
+                        aoi for aoi in aois if len(aoi["poi_ids"]) > 0
+                    ]
+                r_aoi = random.choice(self._aois_with_pois)
+                r_poi = random.choice(r_aoi["poi_ids"])
+                poi = await self.simulator.get_poi(r_poi)
                 next_place = (poi["name"], poi["aoi_id"])
                 await self.simulator.set_aoi_schedules(
                     person_id=agent_id,
                     target_positions=next_place[1],
                 )
-            number_poi_visited = await self.memory.status.get("number_poi_visited")
-            number_poi_visited += 1
-            await self.memory.status.update("number_poi_visited", number_poi_visited)
+            await self.memory.status.incr("number_poi_visited")
             return {
                 "success": True,
                 "evaluation": f"Successfully reached the destination: {next_place}",
@@ -423,12 +575,27 @@ class MobilityBlock(Block):
         self.dispatcher.register_blocks(
             [self.place_selection_block, self.move_block, self.mobility_none_block]
         )
+        # Routing decisions for recurring intentions are cached: the intention
+        # vocabulary is small, so the LLM router is only consulted on new ones
+        self._dispatch_cache: OrderedDict[str, Block] = OrderedDict()
+        self._dispatch_cache_maxsize = 10000
 
     async def forward(self, step, context):  # type:ignore
         """Main entry point - delegates to sub-blocks"""
         self.trigger_time += 1
         # Select the appropriate sub-block using dispatcher
-        selected_block = await self.dispatcher.dispatch(step)
+        dispatch_key = step["intention"].strip().lower()
+        selected_block = self._dispatch_cache.get(dispatch_key)
+        if selected_block is not None:
+            self._dispatch_cache.move_to_end(dispatch_key)
+        else:
+            selected_block = await self.dispatcher.dispatch(step)
+            # A random fallback pick is not a routing decision; caching it
+            # would pin a likely-wrong block for this intention forever
+            if not self.dispatcher.last_dispatch_fallback:
+                self._dispatch_cache[dispatch_key] = selected_block
+                if len(self._dispatch_cache) > self._dispatch_cache_maxsize:
+                    self._dispatch_cache.popitem(last=False)
 
         # Execute the selected sub-block and get the result
         result = await selected_block.forward(step, context)  # type: ignore
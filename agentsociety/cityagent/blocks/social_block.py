@@ -1,27 +1,46 @@
 # Due to the current limitations of the simulator's support, only NoneBlock, MessageBlock, and FindPersonBlock are available in the Dispatcher.
 
-import json
+import ast
+import asyncio
 import logging
+import re
 from typing import Any, Optional
 
+import numpy as np
+
 from agentsociety.environment import Simulator
 from agentsociety.llm import LLM
 from agentsociety.memory import Memory
 from agentsociety.workflow import Block, FormatPrompt
 
 from .dispatcher import BlockDispatcher
-from .utils import TIME_ESTIMATE_PROMPT, clean_json_response
+from .utils import (
+    TIME_ESTIMATE_PROMPT,
+    cached_atext_request,
+    clean_json_response,
+    json_dumps,
+    json_loads,
+)
 
 logger = logging.getLogger("agentsociety")
 
+# Fast path for the expected ['online'|'offline', index] response shape
+FIND_PERSON_RESPONSE_RE = re.compile(r"\[\s*'(online|offline)'\s*,\s*(\d+)\s*\]")
+
 
 class MessagePromptManager:
     """
     Manages the creation of message prompts by dynamically formatting templates with agent-specific data.
     """
 
+    # Compiled FormatPrompt per template string, shared by every manager so a
+    # template is parsed once per process rather than once per agent
+    _prompt_cache: dict[str, FormatPrompt] = {}
+
     def __init__(self):
-        pass
+        # Profile fields are fixed for the lifetime of an agent, so they are
+        # read once and reused as pre-built format kwargs
+        self._static_profile: Optional[dict[str, Any]] = None
 
     async def get_prompt(
         self, memory, step: dict[str, Any], target: str, template: str
@@ -37,40 +56,57 @@ class MessagePromptManager:
         Returns:
             Formatted prompt string with placeholders replaced by agent-specific data.
         """
-        # Retrieve data
-        relationships = await memory.status.get("relationships") or {}
-        chat_histories = await memory.status.get("chat_histories") or {}
+        static_profile = self._static_profile
+        if static_profile is None:
+            profile = await memory.status.mget(
+                ["gender", "education", "personality", "occupation"]
+            )
+            static_profile = self._static_profile = {
+                key: value or "" for key, value in profile.items()
+            }
+
+        # Retrieve the remaining per-step fields in one batched read instead
+        # of sequential awaits
+        status = await memory.status.mget(
+            [
+                "relationships",
+                "chat_histories",
+                "attitude",
+                "emotion_types",
+                "thought",
+            ]
+        )
+        relationships = status["relationships"] or {}
+        chat_histories = status["chat_histories"] or {}
 
-        # Build discussion topic constraints
+        # Build discussion topic constraints (dicts iterate over their keys,
+        # and a missing attitude simply means no constraint)
         discussion_constraint = ""
-        topics = await memory.status.get("attitude")
-        topics = topics.keys()
-        if topics:
-            topics = ", ".join(f'"{topic}"' for topic in topics)
+        attitude = status["attitude"] or {}
+        if attitude:
+            topics = ", ".join(f'"{topic}"' for topic in attitude)
             discussion_constraint = (
                 f"Limit your discussion to the following topics: {topics}."
             )
 
         # Format prompt
-        format_prompt = FormatPrompt(template)
-        format_prompt.format(
-            gender=await memory.status.get("gender") or "",
-            education=await memory.status.get("education") or "",
-            personality=await memory.status.get("personality") or "",
-            occupation=await memory.status.get("occupation") or "",
+        format_prompt = self._prompt_cache.get(template)
+        if format_prompt is None:
+            format_prompt = FormatPrompt(template)
+            self._prompt_cache[template] = format_prompt
+        return format_prompt.format_to_dialog(
+            **static_profile,
             relationship_score=relationships.get(target, 50),
             intention=step.get("intention", ""),
-            emotion_types=await memory.status.get("emotion_types"),
-            thought=await memory.status.get("thought"),
+            emotion_types=status["emotion_types"],
+            thought=status["thought"],
             chat_history=(
                 chat_histories.get(target, "")
                 if isinstance(chat_histories, dict)
                 else ""
             ),
             discussion_constraint=discussion_constraint,
-        )
-
-        return format_prompt.to_dialog()  # type:ignore
+        )  # type:ignore
 
 
 class SocialNoneBlock(Block):
@@ -78,10 +114,12 @@ class SocialNoneBlock(Block):
     NoneBlock
     """
 
+    # Shared across instances; format_to_dialog keeps it stateless
+    guidance_prompt = FormatPrompt(template=TIME_ESTIMATE_PROMPT)
+
     def __init__(self, llm: LLM, memory: Memory):
         super().__init__("NoneBlock", llm=llm, memory=memory)
         self.description = "Handle all other cases"
-        self.guidance_prompt = FormatPrompt(template=TIME_ESTIMATE_PROMPT)
 
     async def forward(self, step, context):  # type:ignore
         """Executes default behavior when no specific block matches the intention.
@@ -93,17 +131,17 @@ class SocialNoneBlock(Block):
         Returns:
             A result dictionary indicating success/failure, time consumed, and execution details.
         """
-        self.guidance_prompt.format(
+        dialog = self.guidance_prompt.format_to_dialog(
             plan=context["plan"],
             intention=step["intention"],
             emotion_types=await self.memory.status.get("emotion_types"),
         )
-        result = await self.llm.atext_request(
-            self.guidance_prompt.to_dialog(), response_format={"type": "json_object"}
+        result = await cached_atext_request(
+            self.llm, dialog, response_format={"type": "json_object"}
         )
         result = clean_json_response(result)  # type:ignore
         try:
-            result = json.loads(result)
+            result = json_loads(result)
             node_id = await self.memory.stream.add_social(
                 description=f"I {step['intention']}"
             )
@@ -133,11 +171,7 @@ class FindPersonBlock(Block):
     Block for selecting an appropriate agent to socialize with based on relationship strength and context.
     """
 
-    def __init__(self, llm: LLM, memory: Memory, simulator: Simulator):
-        super().__init__("FindPersonBlock", llm=llm, memory=memory, simulator=simulator)
-        self.description = "Find a suitable person to socialize with"
-
-        self.prompt = """
+    prompt = """
         Based on the following information, help me select the most suitable friend to interact with:
 
         1. Your Profile:
@@ -169,6 +203,12 @@ class FindPersonBlock(Block):
         ['online', 0]  - means meet the first friend online
         ['offline', 2] - means meet the third friend offline
         """
+    # Parsed once per process and shared; format_to_dialog keeps it stateless
+    format_prompt = FormatPrompt(prompt)
+
+    def __init__(self, llm: LLM, memory: Memory, simulator: Simulator):
+        super().__init__("FindPersonBlock", llm=llm, memory=memory, simulator=simulator)
+        self.description = "Find a suitable person to socialize with"
 
     async def forward(  # type:ignore
         self, step: dict[str, Any], context: Optional[dict] = None
@@ -183,9 +223,22 @@ class FindPersonBlock(Block):
             Result dict with target agent, interaction mode, and execution status.
         """
         try:
-            # Get friends list and relationship strength
-            friends = await self.memory.status.get("friends") or []
-            relationships = await self.memory.status.get("relationships") or {}
+            # Fetch the friends list, relationships and profile fields in one
+            # batched read
+            status = await self.memory.status.mget(
+                [
+                    "friends",
+                    "relationships",
+                    "gender",
+                    "education",
+                    "personality",
+                    "occupation",
+                    "emotion_types",
+                    "thought",
+                ]
+            )
+            friends = status["friends"] or []
+            relationships = status["relationships"] or {}
 
             if not friends:
                 node_id = await self.memory.stream.add_social(
@@ -198,44 +251,37 @@ class FindPersonBlock(Block):
                     "node_id": node_id,
                 }
 
-            # Create a list of friends with all information
-            friend_info = []
-            index_to_id = {}
-
-            for i, friend_id in enumerate(friends):
-                relationship_strength = relationships.get(friend_id, 0)
-                friend_info.append(
-                    {"index": i, "relationship_strength": relationship_strength}
-                )
-                index_to_id[i] = friend_id
-
-            # Format friend information for easier reading
+            # Index-to-ID mapping and formatted friend info in one pass each
+            index_to_id = dict(enumerate(friends))
             formatted_friend_info = {
-                i: {"relationship_strength": info["relationship_strength"]}
-                for i, info in enumerate(friend_info)
+                i: {"relationship_strength": relationships.get(friend_id, 0)}
+                for i, friend_id in enumerate(friends)
             }
 
             # Format the prompt
-            formatted_prompt = FormatPrompt(self.prompt)
-            formatted_prompt.format(
-                gender=str(await self.memory.status.get("gender")),
-                education=str(await self.memory.status.get("education")),
-                personality=str(await self.memory.status.get("personality")),
-                occupation=str(await self.memory.status.get("occupation")),
+            dialog = self.format_prompt.format_to_dialog(
+                gender=str(status["gender"]),
+                education=str(status["education"]),
+                personality=str(status["personality"]),
+                occupation=str(status["occupation"]),
                 intention=str(step.get("intention", "socialize")),
-                emotion_types=str(await self.memory.status.get("emotion_types")),
-                thought=str(await self.memory.status.get("thought")),
+                emotion_types=str(status["emotion_types"]),
+                thought=str(status["thought"]),
                 friend_info=str(formatted_friend_info),
             )
 
-            # Get LLM response
-            response = await self.llm.atext_request(
-                formatted_prompt.to_dialog(), timeout=300
-            )
+            # Get LLM response (cached: identical friend lists and intentions
+            # across agents replay the same selection)
+            response = await cached_atext_request(self.llm, dialog, timeout=300)
 
             try:
-                # Parse the response
-                mode, friend_index = eval(response)  # type:ignore
+                # Parse the response: regex fast path for the expected shape,
+                # restricted literal parsing otherwise (never eval LLM output)
+                match = FIND_PERSON_RESPONSE_RE.search(response)  # type:ignore
+                if match:
+                    mode, friend_index = match.group(1), int(match.group(2))
+                else:
+                    mode, friend_index = ast.literal_eval(response.strip())  # type:ignore
 
                 # Validate the response format
                 if not isinstance(mode, str) or mode not in ["online", "offline"]:
@@ -251,11 +297,19 @@ class FindPersonBlock(Block):
                 context["target"] = target  # type:ignore
             except Exception as e:
                 # If parsing fails, select the friend with the strongest relationship as the default option
-                target = (
-                    max(relationships.items(), key=lambda x: x[1])[0]
-                    if relationships
-                    else friends[0]
-                )
+                if not relationships:
+                    target = friends[0]
+                elif len(relationships) > 100:
+                    # For heavy social graphs a C-level argmax over a
+                    # contiguous buffer beats a per-item Python key function
+                    scores = np.fromiter(
+                        relationships.values(),
+                        dtype=np.float64,
+                        count=len(relationships),
+                    )
+                    target = list(relationships)[int(scores.argmax())]
+                else:
+                    target = max(relationships.items(), key=lambda x: x[1])[0]
                 mode = "online"
 
             node_id = await self.memory.stream.add_social(
@@ -285,11 +339,20 @@ class FindPersonBlock(Block):
 class MessageBlock(Block):
     """Generate and send messages"""
 
-    def __init__(self, agent, llm: LLM, memory: Memory, simulator: Simulator):
+    def __init__(
+        self,
+        agent,
+        llm: LLM,
+        memory: Memory,
+        simulator: Simulator,
+        find_person_block: Optional[FindPersonBlock] = None,
+    ):
         super().__init__("MessageBlock", llm=llm, memory=memory, simulator=simulator)
         self.agent = agent
         self.description = "Send a message to someone"
-        self.find_person_block = FindPersonBlock(llm, memory, simulator)
+        self.find_person_block = find_person_block or FindPersonBlock(
+            llm, memory, simulator
+        )
 
         # configurable fields
         self.default_message_template = """
@@ -322,9 +385,8 @@ class MessageBlock(Block):
             JSON string with message and metadata.
         """
         try:
-            return json.dumps(
-                {"content": message, "propagation_count": propagation_count},
-                ensure_ascii=False,
+            return json_dumps(
+                {"content": message, "propagation_count": propagation_count}
             )
         except Exception as e:
             logger.warning(f"Error serializing message: {e}")
@@ -376,13 +438,15 @@ class MessageBlock(Block):
                 chat_histories[target] += ", "
             chat_histories[target] += f"me: {message}"
 
-            await self.memory.status.update("chat_histories", chat_histories)
-
-            # Send message
+            # The history write, the send and the stream record are independent
+            # of each other, so overlap them instead of paying three round trips
             serialized_message = self._serialize_message(message, 1)
-            await self.agent.send_message_to_agent(target, serialized_message)
-            node_id = await self.memory.stream.add_social(
-                description=f"I sent a message to {target}: {message}"
+            _, _, node_id = await asyncio.gather(
+                self.memory.status.update("chat_histories", chat_histories),
+                self.agent.send_message_to_agent(target, serialized_message),
+                self.memory.stream.add_social(
+                    description=f"I sent a message to {target}: {message}"
+                ),
             )
             return {
                 "success": True,
@@ -417,7 +481,9 @@ class SocialBlock(Block):
     def __init__(self, agent, llm: LLM, memory: Memory, simulator: Simulator):
         super().__init__("SocialBlock", llm=llm, memory=memory, simulator=simulator)
         self.find_person_block = FindPersonBlock(llm, memory, simulator)
-        self.message_block = MessageBlock(agent, llm, memory, simulator)
+        self.message_block = MessageBlock(
+            agent, llm, memory, simulator, find_person_block=self.find_person_block
+        )
         self.noneblock = SocialNoneBlock(llm, memory)
         self.dispatcher = BlockDispatcher(llm)
 
@@ -442,9 +508,6 @@ class SocialBlock(Block):
         """
         try:
             self.trigger_time += 1
-            consumption_start = (
-                self.llm.prompt_tokens_used + self.llm.completion_tokens_used
-            )
 
             # Select the appropriate sub-block using dispatcher
             selected_block = await self.dispatcher.dispatch(step)
@@ -1,5 +1,23 @@
 import ast
+import asyncio
 import re
+from collections import OrderedDict
+from typing import Optional
+
+try:
+    # Optional accelerator: C-level JSON handling for hot LLM-response paths
+    from orjson import dumps as _dumps
+    from orjson import loads as json_loads
+
+    def json_dumps(obj) -> str:
+        return _dumps(obj).decode()
+
+except ImportError:
+    from json import dumps as _dumps
+    from json import loads as json_loads
+
+    def json_dumps(obj) -> str:
+        return _dumps(obj, ensure_ascii=False)
 
 TIME_ESTIMATE_PROMPT = """As an intelligent agent's time estimation system, please estimate the time needed to complete the current action based on the overall plan and current intention.
 
@@ -58,3 +76,78 @@ def clean_json_response(response: str) -> str:
     """remove the special characters in the response"""
     response = response.replace("```json", "").replace("```", "")
     return response.strip()
+
+
+class LLMResponseCache:
+    """
+    Process-wide LRU cache for raw LLM responses.
+
+    Block prompts are highly repetitive across agents (same plan/intention
+    tuples), so identical prompts are answered once and replayed from the
+    cache. Keys are normalized (lowercased, whitespace-collapsed) formatted
+    prompts, values are the raw response strings so callers keep their own
+    parsing and fallback logic.
+    """
+
+    def __init__(self, maxsize: int = 50000):
+        self._maxsize = maxsize
+        self._cache: OrderedDict[str, str] = OrderedDict()
+
+    @staticmethod
+    def normalize(dialog: list[dict[str, str]]) -> str:
+        """Build a normalized cache key from a dialog."""
+        text = " ".join(message.get("content", "") for message in dialog)
+        return re.sub(r"\s+", " ", text).strip().lower()
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        except KeyError:
+            return None
+
+    def put(self, key: str, value: str) -> None:
+        self._cache[key] = value
+        self._cache.move_to_end(key)
+        if len(self._cache) > self._maxsize:
+            self._cache.popitem(last=False)
+
+
+llm_response_cache = LLMResponseCache()
+
+# Singleflight map: identical prompts already in flight are awaited instead of
+# re-issued, so correlated agent behavior does not fan out duplicate requests
+_inflight_requests: dict[str, asyncio.Future] = {}
+
+
+async def cached_atext_request(llm, dialog: list[dict[str, str]], **kwargs):
+    """
+    `llm.atext_request` wrapped with the process-wide response cache and
+    in-flight request coalescing.
+
+    The cache is checked first; on a miss, a concurrent identical request is
+    awaited if one is already in flight, and only otherwise is a new LLM call
+    issued. Responses are stored for subsequent identical prompts
+    (tool-calling responses are not strings and are never cached).
+    """
+    key = llm_response_cache.normalize(dialog)
+    response = llm_response_cache.get(key)
+    if response is not None:
+        return response
+    inflight = _inflight_requests.get(key)
+    if inflight is not None:
+        return await inflight
+    fut: asyncio.Future = asyncio.get_event_loop().create_future()
+    _inflight_requests[key] = fut
+    try:
+        response = await llm.atext_request(dialog, **kwargs)
+        if isinstance(response, str):
+            llm_response_cache.put(key, response)
+        fut.set_result(response)
+    except Exception as e:
+        fut.set_exception(e)
+        fut.exception()  # mark retrieved so lone failures don't warn
+        raise
+    finally:
+        _inflight_requests.pop(key, None)
+    return response
@@ -5,7 +5,7 @@ import logging
 import os
 import time
 from datetime import datetime, timedelta
-from typing import Optional, Union, cast
+from typing import Any, Optional, Union, cast
 
 import ray
 from mosstool.type import TripMode
@@ -52,6 +52,14 @@ class CityMap:
     def query_pois(self, **kwargs):
         return self.map.query_pois(**kwargs)
 
+    def query_pois_batch(self, args_list: list[dict]):
+        """Run several `query_pois` calls inside the actor with one RPC."""
+        return [self.map.query_pois(**kwargs) for kwargs in args_list]
+
+    def get_poi_batch(self, poi_ids: list[int]):
+        """Fetch several POIs inside the actor with one RPC."""
+        return [self.map.pois[poi_id] for poi_id in poi_ids]
+
     def get_poi_cate(self):
         return self.poi_cate
 
@@ -65,6 +73,60 @@ class CityMap:
         return self.map.header["projection"]
 
 
+class RayBatcher:
+    """
+    Coalesces per-agent async calls issued within a short window into one
+    batched downstream call.
+
+    - **Description**:
+        - Callers await `submit(args)`; the first submission in a window starts
+          a flush task which sleeps `tick_ms` milliseconds, hands the
+          accumulated argument list to `batch_fn` in a single call, and
+          resolves each caller's future with the matching element of the
+          returned list. N per-agent round-trips per tick collapse to one.
+    """
+
+    def __init__(self, batch_fn, tick_ms: float = 10.0):
+        """
+        - **Args**:
+            - `batch_fn`: Awaitable callable taking the list of submitted
+              arguments and returning a list of results in the same order.
+            - `tick_ms` (`float`): Length of the coalescing window in milliseconds.
+        """
+        self._batch_fn = batch_fn
+        self._tick_s = tick_ms / 1000
+        self._pending: list[tuple[Any, asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def submit(self, args: Any) -> Any:
+        fut: asyncio.Future = asyncio.get_event_loop().create_future()
+        self._pending.append((args, fut))
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush())
+        return await fut
+
+    async def _flush(self) -> None:
+        # Keep flushing until no submissions remain: callers that arrive while
+        # `batch_fn` is in flight land in `_pending` without starting a new
+        # flush task (this one is not done yet), so they must be picked up
+        # here or their futures would never resolve.
+        while True:
+            await asyncio.sleep(self._tick_s)
+            pending, self._pending = self._pending, []
+            try:
+                results = await self._batch_fn([args for args, _ in pending])
+            except Exception as e:
+                for _, fut in pending:
+                    if not fut.done():
+                        fut.set_exception(e)
+            else:
+                for (_, fut), result in zip(pending, results):
+                    if not fut.done():
+                        fut.set_result(result)
+            if not self._pending:
+                return
+
+
 class Simulator:
     """
     Main class of the simulator.
@@ -138,6 +200,15 @@ class Simulator:
         self._lock = asyncio.Lock()
         self._environment_prompt: dict[str, str] = {}
         self._log_list = []
+        # Per-tick coalescing layers: collapse per-agent round-trips into one
+        # batched call per window
+        self._query_pois_batcher = RayBatcher(
+            lambda args: self.map.query_pois_batch.remote(args)  # type:ignore
+        )
+        self._get_poi_batcher = RayBatcher(
+            lambda args: self.map.get_poi_batch.remote(args)  # type:ignore
+        )
+        self._schedule_batcher = RayBatcher(self._set_aoi_schedules_batch)
 
     def set_map(self, map: ray.ObjectRef):
         self._map = map
@@ -203,6 +274,34 @@ class Simulator:
         """
         self._environment_prompt[key] = value
 
+    async def query_pois(self, **kwargs) -> list:
+        """
+        Query POIs through the per-tick batching layer.
+
+        - **Description**:
+            - Calls issued by concurrent agents within the same coalescing
+              window are shipped to the map actor as a single Ray RPC.
+
+        - **Args**:
+            - `**kwargs`: Forwarded to the map's `query_pois`.
+
+        - **Returns**:
+            - `list`: The query result for this caller.
+        """
+        return await self._query_pois_batcher.submit(kwargs)
+
+    async def get_poi(self, poi_id: int) -> dict:
+        """
+        Fetch a single POI through the per-tick batching layer.
+
+        - **Args**:
+            - `poi_id` (`int`): The ID of the POI to fetch.
+
+        - **Returns**:
+            - `dict`: The POI data.
+        """
+        return await self._get_poi_batcher.submit(poi_id)
+
     @log_execution_time
     def get_poi_categories(
         self,
@@ -345,7 +444,34 @@ class Simulator:
             - `modes` (`Optional[List[int]]`): Travel modes for each trip.
               Defaults to `TRIP_MODE_DRIVE_ONLY` if not specified.
         """
+        await self._schedule_batcher.submit(
+            (person_id, target_positions, departure_times, modes)
+        )
+
+    async def _set_aoi_schedules_batch(self, batch: list[tuple]) -> list[None]:
+        """Send SetSchedule requests for all calls coalesced in one window."""
         cur_time = float(await self.get_time())
+        reqs = [
+            self._make_schedule_request(
+                person_id, target_positions, departure_times, modes, cur_time
+            )
+            for person_id, target_positions, departure_times, modes in batch
+        ]
+        await asyncio.gather(
+            *(self._client.person_service.SetSchedule(req) for req in reqs)
+        )
+        return [None for _ in batch]
+
+    def _make_schedule_request(
+        self,
+        person_id: int,
+        target_positions: Union[
+            list[Union[int, tuple[int, int]]], Union[int, tuple[int, int]]
+        ],
+        departure_times: Optional[list[float]],
+        modes: Optional[list[TripMode]],
+        cur_time: float,
+    ) -> dict:
         if not isinstance(target_positions, list):
             target_positions = [target_positions]
         if departure_times is None:
@@ -392,8 +518,7 @@ class Simulator:
             _schedules.append(
                 {"trips": trips, "loop_count": 1, "departure_time": _time}
             )
-        req = {"person_id": person_id, "schedules": _schedules}
-        await self._client.person_service.SetSchedule(req)
+        return {"person_id": person_id, "schedules": _schedules}
 
     @log_execution_time
     async def reset_person_position(
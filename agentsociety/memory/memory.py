@@ -744,6 +744,86 @@ class StatusMemory:
         else:
             return default_value
 
+    @lock_decorator
+    async def mget(
+        self,
+        keys: Sequence[Any],
+        default_value: Optional[Any] = None,
+        mode: Union[Literal["read only"], Literal["read and write"]] = "read only",
+    ) -> dict[Any, Any]:
+        """
+        Retrieve several values from the memory in a single locked pass.
+
+        - **Description**:
+            - Equivalent to calling `get` for each key but acquires the memory
+              lock once, so hot paths that need multiple fields avoid repeated
+              round-trips through the lock.
+
+        - **Args**:
+            - `keys` (Sequence[Any]): The keys to retrieve.
+            - `default_value` (Optional[Any], optional): Default value for keys that are not found. Defaults to None.
+            - `mode` (Union[Literal["read only"], Literal["read and write"]], optional): Access mode for the values. Defaults to "read only".
+
+        - **Returns**:
+            - `dict[Any, Any]`: Mapping from each requested key to its value.
+
+        - **Raises**:
+            - `ValueError`: If an invalid mode is provided.
+            - `KeyError`: If a key is not found in any of the memory sections and no default value is provided.
+        """
+        if mode == "read only":
+            process_func = deepcopy
+        elif mode == "read and write":
+            process_func = lambda x: x
+        else:
+            raise ValueError(f"Invalid get mode `{mode}`!")
+
+        result: dict[Any, Any] = {}
+        for key in keys:
+            for mem in [self.state, self.profile, self.dynamic]:
+                try:
+                    value = await mem.get(key)
+                    result[key] = process_func(value)
+                    break
+                except KeyError:
+                    continue
+            else:
+                if default_value is None:
+                    raise KeyError(f"No attribute `{key}` in memories!")
+                result[key] = default_value
+        return result
+
+    @lock_decorator
+    async def incr(self, key: Any, delta: int = 1) -> int:
+        """
+        Atomically increment a numeric value under the memory lock.
+
+        - **Description**:
+            - Replaces the get-then-update pattern for counters with a single
+              locked read-modify-write, avoiding both the extra round-trip and
+              the race between concurrent coroutines. Intended for plain
+              numeric fields; embedding refresh and watchers are not triggered.
+
+        - **Args**:
+            - `key` (Any): The key of the counter to increment.
+            - `delta` (int, optional): The amount to add. Defaults to 1.
+
+        - **Returns**:
+            - `int`: The new value of the counter.
+
+        - **Raises**:
+            - `KeyError`: If the key is not found in any of the memory sections.
+        """
+        for mem in [self.state, self.profile, self.dynamic]:
+            try:
+                value = await mem.get(key)
+            except KeyError:
+                continue
+            new_value = value + delta
+            await mem.update(key, new_value, False)
+            return new_value
+        raise KeyError(f"No attribute `{key}` in memories!")
+
     @lock_decorator
     async def update(
         self,
@@ -3,6 +3,7 @@ Base class of memory
 """
 
 import asyncio
+import itertools
 import logging
 import time
 from abc import ABC, abstractmethod
@@ -14,6 +15,28 @@ from .const import *
 logger = logging.getLogger("agentsociety")
 
 
+def key_at(memories: dict, index: int) -> Any:
+    """
+    Return the insertion-order key at `index` without materializing the full
+    key list (O(index) iteration instead of an O(n) list allocation).
+
+    - **Args**:
+        - `memories` (dict): The memory mapping to index into.
+        - `index` (int): The positional index; negative indices are supported.
+
+    - **Raises**:
+        - `IndexError`: If the index is out of range.
+    """
+    if index < 0:
+        index += len(memories)
+        if index < 0:
+            raise IndexError("memory index out of range")
+    try:
+        return next(itertools.islice(memories, index, None))
+    except StopIteration:
+        raise IndexError("memory index out of range") from None
+
+
 class MemoryUnit:
     """
     A class used to manage a unit of memory that can be updated asynchronously.
@@ -52,28 +75,26 @@ class MemoryUnit:
             self._content.update(content)
         if activate_timestamp and TIME_STAMP_KEY not in self._content:
             self._content[TIME_STAMP_KEY] = time.time()
-        for _prop, _value in self._content.items():
-            self._set_attribute(_prop, _value)
 
     def __getitem__(self, key: Any) -> Any:
         return self._content[key]
 
-    def _create_property(self, property_name: str, property_value: Any):
-
-        def _getter(self):
-            return getattr(self, f"{SELF_DEFINE_PREFIX}{property_name}", None)
-
-        def _setter(self, value):
-            setattr(self, f"{SELF_DEFINE_PREFIX}{property_name}", value)
-
-        setattr(self.__class__, property_name, property(_getter, _setter))
-        setattr(self, f"{SELF_DEFINE_PREFIX}{property_name}", property_value)
-
-    def _set_attribute(self, property_name: str, property_value: Any):
-        if not hasattr(self, f"{SELF_DEFINE_PREFIX}{property_name}"):
-            self._create_property(property_name, property_value)
+    def __getattr__(self, name: str) -> Any:
+        # Attributes are backed directly by `_content`; no per-attribute
+        # property descriptors are installed on the class (which would leak
+        # between instances and cost a setattr per attribute per update)
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self.__dict__["_content"][name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name.startswith("_"):
+            object.__setattr__(self, name, value)
         else:
-            setattr(self, f"{SELF_DEFINE_PREFIX}{property_name}", property_value)
+            self._content[name] = value
 
     async def update(self, content: dict) -> None:
         """
@@ -96,10 +117,8 @@ class MemoryUnit:
                         f"Type warning: The type of the value for key '{k}' is changing from `{orig_type.__name__}` to `{new_type.__name__}`!"
                     )
         self._content.update(content)
-        for _prop, _value in self._content.items():
-            self._set_attribute(_prop, _value)
         if self._activate_timestamp:
-            self._set_attribute(TIME_STAMP_KEY, time.time())
+            self._content[TIME_STAMP_KEY] = time.time()
         self._lock.release()
 
     async def clear(self) -> None:
@@ -237,14 +256,20 @@ class MemoryBase(ABC):
             - `Sequence[Any]`: A sequence of recent memory keys.
         """
         _memories = self._memories
-        _list_units = list(_memories.keys())
         if recent_n is None:
-            return _list_units
+            return list(_memories)
         if len(_memories) < recent_n:
             logger.debug(
                 f"Length of memory {len(_memories)} is less than recent_n {recent_n}, returning all available memories."
             )
-        return _list_units[-recent_n:]
+        # walk only the last `recent_n` keys instead of materializing all of them
+        return list(itertools.islice(reversed(_memories), recent_n))[::-1]
+
+    def _latest_unit(self) -> Any:
+        """
+        Return the most recently inserted memory unit without building any list.
+        """
+        return next(reversed(self._memories))
 
     # interact
     @abstractmethod
@@ -273,4 +298,4 @@ class MemoryBase(ABC):
         raise NotImplementedError
 
     def __getitem__(self, index: Any) -> Any:
-        return list(self._memories.keys())[index]
+        return key_at(self._memories, index)
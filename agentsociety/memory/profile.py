@@ -8,7 +8,7 @@ from typing import Any, Optional, Union, cast
 
 from ..utils.decorators import lock_decorator
 from .const import *
-from .memory_base import MemoryBase, MemoryUnit
+from .memory_base import MemoryBase, MemoryUnit, key_at
 from .utils import convert_msg_to_sequence
 
 
@@ -42,8 +42,9 @@ class ProfileMemory(MemoryBase):
             sequence_type=ProfileMemoryUnit,
             activate_timestamp=self.activate_timestamp,
         )
+        _memories = self._memories
         for unit in msg:
-            self._memories[unit] = {}
+            _memories[unit] = {}
 
     @lock_decorator
     async def add(
@@ -56,15 +57,14 @@ class ProfileMemory(MemoryBase):
             activate_timestamp=self.activate_timestamp,
         )
         for unit in msg:
-            if unit not in _memories:
-                _memories[unit] = {}
+            _memories.setdefault(unit, {})
 
     @lock_decorator
     async def pop(self, index: int) -> ProfileMemoryUnit:
 
         _memories = self._memories
         try:
-            pop_unit = list(_memories.keys())[index]
+            pop_unit = key_at(_memories, index)
             _memories.pop(pop_unit)
 
             return pop_unit
@@ -85,16 +85,17 @@ class ProfileMemory(MemoryBase):
             sequence_type=ProfileMemoryUnit,
             activate_timestamp=self.activate_timestamp,
         )
+        _memories = self._memories
         for unit in msg:
-            if unit not in self._memories:
-                self._memories[unit] = {}
+            _memories.setdefault(unit, {})
 
     @lock_decorator
     async def export(
         self,
     ) -> Sequence[dict]:
         _res = []
-        for m in self._memories.keys():
+        _memories = self._memories
+        for m in _memories.keys():
             m = cast(ProfileMemoryUnit, m)
             _dict_values = await m.dict_values()
             _res.append(_dict_values)
@@ -107,8 +108,7 @@ class ProfileMemory(MemoryBase):
     # interact
     @lock_decorator
     async def get(self, key: Any):
-        _latest_memories = self._fetch_recent_memory()
-        _latest_memory: ProfileMemoryUnit = _latest_memories[-1]
+        _latest_memory: ProfileMemoryUnit = self._latest_unit()
         return _latest_memory[key]
 
     # @lock_decorator
@@ -127,8 +127,7 @@ class ProfileMemory(MemoryBase):
 
     @lock_decorator
     async def update(self, key: Any, value: Any, store_snapshot: bool = False):
-        _latest_memories = self._fetch_recent_memory()
-        _latest_memory: ProfileMemoryUnit = _latest_memories[-1]
+        _latest_memory: ProfileMemoryUnit = self._latest_unit()
         if not store_snapshot:
             # write in place
             await _latest_memory.update({key: value})
@@ -141,14 +140,11 @@ class ProfileMemory(MemoryBase):
             )
             _content.update({key: value})
             msg = ProfileMemoryUnit(_content, self.activate_timestamp)
-            for unit in [msg]:
-                if unit not in self._memories:
-                    self._memories[unit] = {}
+            self._memories.setdefault(msg, {})
 
     @lock_decorator
     async def update_dict(self, to_update_dict: dict, store_snapshot: bool = False):
-        _latest_memories = self._fetch_recent_memory()
-        _latest_memory: ProfileMemoryUnit = _latest_memories[-1]
+        _latest_memory: ProfileMemoryUnit = self._latest_unit()
         if not store_snapshot:
             # write in place
             await _latest_memory.update(to_update_dict)
@@ -160,6 +156,4 @@ class ProfileMemory(MemoryBase):
             )
             _content.update(to_update_dict)
             msg = ProfileMemoryUnit(_content, self.activate_timestamp)
-            for unit in [msg]:
-                if unit not in self._memories:
-                    self._memories[unit] = {}
+            self._memories.setdefault(msg, {})
@@ -8,7 +8,7 @@ from typing import Any, Optional, Union, cast
 
 from ..utils.decorators import lock_decorator
 from .const import *
-from .memory_base import MemoryBase, MemoryUnit
+from .memory_base import MemoryBase, MemoryUnit, key_at
 from .utils import convert_msg_to_sequence
 
 
@@ -52,14 +52,13 @@ class DynamicMemory(MemoryBase):
             activate_timestamp=self.activate_timestamp,
         )
         for unit in msg:
-            if unit not in _memories:
-                _memories[unit] = {}
+            _memories.setdefault(unit, {})
 
     @lock_decorator
     async def pop(self, index: int) -> DynamicMemoryUnit:
         _memories = self._memories
         try:
-            pop_unit = list(_memories.keys())[index]
+            pop_unit = key_at(_memories, index)
             _memories.pop(pop_unit)
 
             return pop_unit
@@ -80,16 +79,17 @@ class DynamicMemory(MemoryBase):
             sequence_type=DynamicMemoryUnit,
             activate_timestamp=self.activate_timestamp,
         )
+        _memories = self._memories
         for unit in msg:
-            if unit not in self._memories:
-                self._memories[unit] = {}
+            _memories.setdefault(unit, {})
 
     @lock_decorator
     async def export(
         self,
     ) -> Sequence[dict]:
         _res = []
-        for m in self._memories.keys():
+        _memories = self._memories
+        for m in _memories.keys():
             m = cast(DynamicMemoryUnit, m)
             _dict_values = await m.dict_values()
             _res.append(_dict_values)
@@ -102,8 +102,7 @@ class DynamicMemory(MemoryBase):
     # interact
     @lock_decorator
     async def get(self, key: Any):
-        _latest_memories = self._fetch_recent_memory()
-        _latest_memory: DynamicMemoryUnit = _latest_memories[-1]
+        _latest_memory: DynamicMemoryUnit = self._latest_unit()
 
         return _latest_memory[key]
 
@@ -123,8 +122,7 @@ class DynamicMemory(MemoryBase):
 
     @lock_decorator
     async def update(self, key: Any, value: Any, store_snapshot: bool = False):
-        _latest_memories = self._fetch_recent_memory()
-        _latest_memory: DynamicMemoryUnit = _latest_memories[-1]
+        _latest_memory: DynamicMemoryUnit = self._latest_unit()
         if not store_snapshot:
             # write in place
             await _latest_memory.update({key: value})
@@ -139,14 +137,11 @@ class DynamicMemory(MemoryBase):
             msg = DynamicMemoryUnit(
                 _content, self._required_attributes, self.activate_timestamp
             )
-            for unit in [msg]:
-                if unit not in self._memories:
-                    self._memories[unit] = {}
+            self._memories.setdefault(msg, {})
 
     @lock_decorator
     async def update_dict(self, to_update_dict: dict, store_snapshot: bool = False):
-        _latest_memories = self._fetch_recent_memory()
-        _latest_memory: DynamicMemoryUnit = _latest_memories[-1]
+        _latest_memory: DynamicMemoryUnit = self._latest_unit()
         if not store_snapshot:
             # write in place
             await _latest_memory.update(to_update_dict)
@@ -160,6 +155,4 @@ class DynamicMemory(MemoryBase):
             msg = DynamicMemoryUnit(
                 _content, self._required_attributes, self.activate_timestamp
             )
-            for unit in [msg]:
-                if unit not in self._memories:
-                    self._memories[unit] = {}
+            self._memories.setdefault(msg, {})
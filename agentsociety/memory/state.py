@@ -8,7 +8,7 @@ from typing import Any, Optional, Union, cast
 
 from ..utils.decorators import lock_decorator
 from .const import *
-from .memory_base import MemoryBase, MemoryUnit
+from .memory_base import MemoryBase, MemoryUnit, key_at
 from .utils import convert_msg_to_sequence
 
 
@@ -42,8 +42,9 @@ class StateMemory(MemoryBase):
             sequence_type=StateMemoryUnit,
             activate_timestamp=self.activate_timestamp,
         )
+        _memories = self._memories
         for unit in msg:
-            self._memories[unit] = {}
+            _memories[unit] = {}
 
     @lock_decorator
     async def add(self, msg: Union[MemoryUnit, Sequence[MemoryUnit]]) -> None:
@@ -55,15 +56,14 @@ class StateMemory(MemoryBase):
             activate_timestamp=self.activate_timestamp,
         )
         for unit in msg:
-            if unit not in _memories:
-                _memories[unit] = {}
+            _memories.setdefault(unit, {})
 
     @lock_decorator
     async def pop(self, index: int) -> MemoryUnit:
 
         _memories = self._memories
         try:
-            pop_unit = list(_memories.keys())[index]
+            pop_unit = key_at(_memories, index)
             _memories.pop(pop_unit)
 
             return pop_unit
@@ -85,9 +85,9 @@ class StateMemory(MemoryBase):
             sequence_type=StateMemoryUnit,
             activate_timestamp=self.activate_timestamp,
         )
+        _memories = self._memories
         for unit in msg:
-            if unit not in self._memories:
-                self._memories[unit] = {}
+            _memories.setdefault(unit, {})
 
     @lock_decorator
     async def export(
@@ -95,7 +95,8 @@ class StateMemory(MemoryBase):
     ) -> Sequence[dict]:
 
         _res = []
-        for m in self._memories.keys():
+        _memories = self._memories
+        for m in _memories.keys():
             m = cast(StateMemoryUnit, m)
             _dict_values = await m.dict_values()
             _res.append(_dict_values)
@@ -110,8 +111,7 @@ class StateMemory(MemoryBase):
     @lock_decorator
     async def get(self, key: Any):
 
-        _latest_memories = self._fetch_recent_memory()
-        _latest_memory: StateMemoryUnit = _latest_memories[-1]
+        _latest_memory: StateMemoryUnit = self._latest_unit()
 
         return _latest_memory[key]
 
@@ -133,8 +133,7 @@ class StateMemory(MemoryBase):
     @lock_decorator
     async def update(self, key: Any, value: Any, store_snapshot: bool = False):
 
-        _latest_memories = self._fetch_recent_memory()
-        _latest_memory: StateMemoryUnit = _latest_memories[-1]
+        _latest_memory: StateMemoryUnit = self._latest_unit()
         if not store_snapshot:
             # write in place
             await _latest_memory.update({key: value})
@@ -147,15 +146,12 @@ class StateMemory(MemoryBase):
             )
             _content.update({key: value})
             msg = StateMemoryUnit(_content, self.activate_timestamp)
-            for unit in [msg]:
-                if unit not in self._memories:
-                    self._memories[unit] = {}
+            self._memories.setdefault(msg, {})
 
     @lock_decorator
     async def update_dict(self, to_update_dict: dict, store_snapshot: bool = False):
 
-        _latest_memories = self._fetch_recent_memory()
-        _latest_memory: StateMemoryUnit = _latest_memories[-1]
+        _latest_memory: StateMemoryUnit = self._latest_unit()
         if not store_snapshot:
             # write in place
             await _latest_memory.update(to_update_dict)
@@ -168,6 +164,4 @@ class StateMemory(MemoryBase):
             )
             _content.update(to_update_dict)
             msg = StateMemoryUnit(_content, self.activate_timestamp)
-            for unit in [msg]:
-                if unit not in self._memories:
-                    self._memories[unit] = {}
+            self._memories.setdefault(msg, {})
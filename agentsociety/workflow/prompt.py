@@ -1,4 +1,5 @@
 import re
+from string import Formatter
 from typing import Optional, Union
 
 
@@ -27,6 +28,57 @@ class FormatPrompt:
         self.system_prompt = system_prompt  # Store the system prompt
         self.variables = self._extract_variables()
         self.formatted_string = ""  # To store the formatted string
+        # The system message is static; build it once and reuse it in every dialog
+        self._system_message = (
+            {"role": "system", "content": system_prompt} if system_prompt else None
+        )
+        # Parse the template once so format() is a join over precomputed
+        # chunks instead of re-scanning the template string on every call
+        self._compiled = self._compile_template()
+
+    def _compile_template(self) -> Optional[list[tuple[str, Optional[str]]]]:
+        """
+        - **Description**:
+            - Parses the template into (literal, field) chunks once at
+              construction. Templates using format specs, conversions or
+              non-identifier fields are not precompiled and fall back to
+              `str.format` at render time.
+
+        - **Returns**:
+            - `Optional[List[Tuple[str, Optional[str]]]]`: The parsed chunks,
+              or None when the template is not precompilable.
+        """
+        chunks = []
+        try:
+            for literal, field, spec, conversion in Formatter().parse(self.template):
+                if field is not None and (
+                    spec or conversion or not field.isidentifier()
+                ):
+                    return None
+                chunks.append((literal, field))
+        except ValueError:
+            return None
+        return chunks
+
+    def _render(self, kwargs: dict) -> str:
+        """
+        - **Description**:
+            - Renders the template with the given variables, using the
+              precompiled chunks when available.
+
+        - **Raises**:
+            - `KeyError`: If a placeholder in the template does not have a corresponding key in kwargs.
+        """
+        compiled = self._compiled
+        if compiled is None:
+            return self.template.format(**kwargs)
+        parts = []
+        for literal, field in compiled:
+            if literal:
+                parts.append(literal)
+            if field is not None:
+                parts.append(str(kwargs[field]))
+        return "".join(parts)
 
     def _extract_variables(self) -> list[str]:
         """
@@ -52,9 +104,7 @@ class FormatPrompt:
         - **Raises**:
             - `KeyError`: If a placeholder in the template does not have a corresponding key in kwargs.
         """
-        self.formatted_string = self.template.format(
-            **kwargs
-        )  # Store the formatted string
+        self.formatted_string = self._render(kwargs)  # Store the formatted string
         return self.formatted_string
 
     def to_dialog(self) -> list[dict[str, str]]:
@@ -66,15 +116,32 @@ class FormatPrompt:
             - `List[Dict[str, str]]`: A list representing the dialog with roles and content.
         """
         dialog = []
-        if self.system_prompt:
-            dialog.append(
-                {"role": "system", "content": self.system_prompt}
-            )  # Add system prompt if it exists
+        if self._system_message is not None:
+            dialog.append(self._system_message)  # Add system prompt if it exists
         dialog.append(
             {"role": "user", "content": self.formatted_string}
         )  # Add user content
         return dialog
 
+    def format_to_dialog(self, **kwargs) -> list[dict[str, str]]:
+        """
+        - **Description**:
+            - Formats the template and returns the dialog in one step without
+              mutating instance state, so a single FormatPrompt can be shared
+              safely across agents and concurrent coroutines.
+
+        - **Args**:
+            - `**kwargs`: Variable names and their corresponding values to format the template.
+
+        - **Returns**:
+            - `List[Dict[str, str]]`: A list representing the dialog with roles and content.
+        """
+        dialog = []
+        if self._system_message is not None:
+            dialog.append(self._system_message)
+        dialog.append({"role": "user", "content": self._render(kwargs)})
+        return dialog
+
     def log(self) -> None:
         """
         - **Description**: